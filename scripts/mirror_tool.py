@@ -10,19 +10,24 @@ Design goals (Unix-y):
 """
 
 from __future__ import annotations
-import argparse, os, sys, time, subprocess, hashlib
+import argparse, contextlib, functools, os, sys, time, shutil, sqlite3, subprocess, tempfile, hashlib
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
 from shutil import which
 
 # --- Optional deps ---
 try:
     from blake3 import blake3 as blake3_hasher  # type: ignore
     HAVE_BLAKE3 = True
+    B3_AUTO = getattr(blake3_hasher, 'AUTO', -1)
 except Exception:
     blake3_hasher = None  # type: ignore
     HAVE_BLAKE3 = False
+    B3_AUTO = -1
 
 try:
     from tqdm import tqdm  # type: ignore
@@ -31,56 +36,274 @@ except Exception:
     tqdm = None  # type: ignore
     HAVE_TQDM = False
 
+try:
+    from Crypto.Hash import SHA256 as _fastsha  # type: ignore
+    HAVE_FASTSHA = True
+except Exception:
+    _fastsha = None  # type: ignore
+    HAVE_FASTSHA = False
+
+# SHA-256 backend: hashlib (OpenSSL) unless MIRROR_SHA256_BACKEND=pycryptodome.
+# Opt-in because pycryptodome has no SHA-NI path; it only pays off where the
+# bundled OpenSSL lacks a fast SHA-256 for this CPU. Read from the environment
+# so process-pool workers pick up the same choice.
+USE_FASTSHA = HAVE_FASTSHA and os.environ.get('MIRROR_SHA256_BACKEND') == 'pycryptodome'
+
+def new_sha256(data: bytes = b''):
+    if USE_FASTSHA:
+        return _fastsha.new(data)
+    return hashlib.sha256(data)
+
+# hashers take plain str paths on the hot path; Path still works
+StrPath = Union[str, Path]
+
 # --- Defaults & filters ---
 EXCLUDES = {'.DS_Store'}
 EXCLUDE_PREFIXES = ('._',)
 
 # --- Helpers for external tools ---
+@functools.lru_cache(maxsize=None)
 def have_cmd(name: str) -> bool:
     return which(name) is not None
 
-def b3sum_one(path: Path) -> str:
+def b3sum_one(path: StrPath) -> str:
     """Return hex digest using external `b3sum`."""
     out = subprocess.check_output(['b3sum', str(path)], text=True)
     # format is "<hash>  <path>\n"
     return out.split()[0]
 
+def b3sum_many(paths: Iterable[str], batch: int = 512,
+               cwd: Optional[Path] = None) -> Iterator[Tuple[str, str]]:
+    """Yield (path, hex digest) using one external `b3sum` per batch of paths.
+
+    `paths` is consumed lazily; relative paths are resolved against `cwd`.
+    """
+    it = iter(paths)
+    while True:
+        names = [str(p) for p in islice(it, batch)]
+        if not names:
+            break
+        out = subprocess.run(['b3sum', '--', *names], stdout=subprocess.PIPE, cwd=cwd, check=True).stdout
+        # b3sum prints one "<hash>  <name>" line per argument, in argument
+        # order; names are printed lossily (and backslash-escaped), so pair
+        # lines with our arguments by position instead of parsing the name
+        lines = out.split(b'\n')[:-1]
+        if len(lines) != len(names):
+            raise RuntimeError(f"b3sum returned {len(lines)} digests for {len(names)} files")
+        for name, line in zip(names, lines):
+            yield name, line.split(b'  ', 1)[0].lstrip(b'\\').decode('ascii')
+
 # --- File iteration ---
-def iter_rel_files(root: Path) -> Iterable[Path]:
-    for p in root.rglob('*'):
-        if p.is_file():
-            n = p.name
-            if n in EXCLUDES or n.startswith(EXCLUDE_PREFIXES):
-                continue
-            yield p.relative_to(root)
+def iter_rel_files(root: Path) -> Iterator[Tuple[str, str]]:
+    """Yield (path, relative POSIX path) strings for each file under root."""
+    # explicit scandir DFS: DirEntry reuses d_type from the directory read,
+    # so there is no per-entry stat(); the relative path is a plain slice
+    # of entry.path, which on POSIX already is the manifest form
+    cut = len(os.path.join(str(root), ''))
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    n = entry.name
+                    if n in EXCLUDES or n.startswith(EXCLUDE_PREFIXES):
+                        continue
+                    rel = entry.path[cut:]
+                    if os.sep != '/':
+                        rel = rel.replace(os.sep, '/')
+                    yield entry.path, rel
+
+# --- Page-cache hints ---
+# Files are streamed once and never re-read: ask for aggressive read-ahead,
+# then drop the pages so a multi-GB mirror doesn't evict everything else.
+HAVE_FADVISE = hasattr(os, 'posix_fadvise')
+
+def _advise_sequential(f) -> None:
+    if HAVE_FADVISE:
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+def _advise_dontneed(f) -> None:
+    if HAVE_FADVISE:
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+# --- Read-ahead backend ---
+READAHEAD_DEPTH = 4
+READAHEAD_BLOCK = 4 * 1024 * 1024
+
+def hash_file_readahead(path: StrPath, h, qd: int = READAHEAD_DEPTH, bs: int = READAHEAD_BLOCK) -> str:
+    """Feed `h` from `path` with up to `qd` preadv() calls of `bs` bytes in
+    flight, so the next blocks are being read while this one is hashed."""
+    bufs = [bytearray(bs) for _ in range(qd)]
+    inflight: deque = deque()
+    off = 0
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if HAVE_FADVISE:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        with ThreadPoolExecutor(max_workers=qd) as io:
+            for buf in bufs:
+                inflight.append((io.submit(os.preadv, fd, [buf], off), buf))
+                off += bs
+            # blocks are consumed in submission order; a freed buffer is
+            # immediately resubmitted for the next offset
+            while inflight:
+                fut, buf = inflight.popleft()
+                n = fut.result()
+                if n:
+                    h.update(memoryview(buf)[:n])
+                if n < bs:
+                    break  # EOF
+                inflight.append((io.submit(os.preadv, fd, [buf], off), buf))
+                off += bs
+        if HAVE_FADVISE:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return h.hexdigest()
+
+def _use_readahead(path: StrPath, io_backend: str) -> bool:
+    # single-block files gain nothing from having reads in flight
+    return io_backend == 'readahead' and os.stat(path).st_size > READAHEAD_BLOCK
 
 # --- Hashers ---
-def sha256_file(path: Path, chunk: int = 4 * 1024 * 1024) -> str:
-    h = hashlib.sha256()
-    with path.open('rb') as f:
+B3_MMAP_MIN = 1024 * 1024  # below this a single read beats mmap setup
+
+def sha256_file(path: StrPath, chunk: int = 4 * 1024 * 1024, io_backend: str = 'sync') -> str:
+    if _use_readahead(path, io_backend):
+        return hash_file_readahead(path, new_sha256())
+    # readinto one reused buffer: no per-chunk bytes objects, and 4 MiB reads
+    # keep Python-level iterations low (hashlib.file_digest loops in Python
+    # over 256 KiB)
+    h = new_sha256()
+    mv = memoryview(bytearray(chunk))
+    with open(path, 'rb', buffering=0) as f:
+        _advise_sequential(f)
         while True:
-            b = f.read(chunk)
-            if not b:
+            n = f.readinto(mv)
+            if not n:
                 break
-            h.update(b)
+            h.update(mv[:n])
+        _advise_dontneed(f)
     return h.hexdigest()
 
-def blake3_file_py(path: Path, max_threads: int = 0, chunk: int = 4 * 1024 * 1024) -> str:
+def blake3_file_py(path: StrPath, max_threads: int = 0, chunk: int = 4 * 1024 * 1024,
+                   io_backend: str = 'sync') -> str:
     """BLAKE3 via Python binding; max_threads: 0 -> AUTO."""
     if not HAVE_BLAKE3:
         raise RuntimeError("blake3 module not available")
-    h = blake3_hasher(max_threads=max_threads)
-    with path.open('rb') as f:
+    h = blake3_hasher(max_threads=max_threads or B3_AUTO)
+    size = os.stat(path).st_size
+    if size < B3_MMAP_MIN:
+        # small file: one read, no mmap setup
+        with open(path, 'rb', buffering=0) as f:
+            h.update(f.read())
+        return h.hexdigest()
+    if hasattr(h, 'update_mmap'):
+        # blake3 >= 0.4: the Rust side maps the whole file and can spread it
+        # across its own threads under a single GIL release
+        h.update_mmap(path)
+        return h.hexdigest()
+    if io_backend == 'readahead' and size > READAHEAD_BLOCK:
+        return hash_file_readahead(path, h)
+    mv = memoryview(bytearray(chunk))
+    with open(path, 'rb', buffering=0) as f:
+        _advise_sequential(f)
         while True:
-            b = f.read(chunk)
-            if not b:
+            n = f.readinto(mv)
+            if not n:
                 break
-            h.update(b)
+            h.update(mv[:n])
+        _advise_dontneed(f)
     return h.hexdigest()
 
+def hash_small_file(path: str, algo: str) -> str:
+    """Hash a small file with one read; no pool round-trip, no fadvise."""
+    with open(path, 'rb', buffering=0) as f:
+        data = f.read()
+    if algo == 'sha256':
+        return new_sha256(data).hexdigest()
+    return blake3_hasher(data).hexdigest()
+
+def _hash_sha256_worker(args: Tuple[str, str], io_backend: str = 'sync') -> Tuple[str, str]:
+    """Process-pool entry point: (abs path, rel path) -> (rel path, digest)."""
+    path, rp_str = args
+    return rp_str, sha256_file(path, io_backend=io_backend)
+
+# --- Hasher selection ---
+# backend -> algorithm it produces, and the default manifest name for each
+ALGO_OF = {'b3sum': 'blake3', 'blake3': 'blake3', 'sha256': 'sha256'}
+MANIFEST_NAMES = {'blake3': 'BLAKE3SUMS', 'sha256': 'SHA256SUMS'}
+
+def resolve_backend(algo: str, prefer_external_b3: bool) -> str:
+    """Pick 'b3sum', 'blake3' (Python binding) or 'sha256' for --algo.
+
+    auto tries b3sum, then the binding, then falls back to sha256; blake3
+    tries them in --prefer-external-b3 order and fails if neither exists.
+    """
+    if algo == 'sha256':
+        return 'sha256'
+    order = ('b3sum', 'blake3') if (algo == 'auto' or prefer_external_b3) else ('blake3', 'b3sum')
+    for backend in order:
+        if backend == 'b3sum' and have_cmd('b3sum'):
+            return backend
+        if backend == 'blake3' and HAVE_BLAKE3:
+            return backend
+    if algo == 'auto':
+        return 'sha256'
+    raise RuntimeError("blake3 requested but neither b3sum nor the blake3 module is available")
+
+def select_hasher(
+    algo: str,
+    b3threads: int,
+    prefer_external_b3: bool,
+    io_backend: str = 'sync',
+) -> Tuple[str, Callable[[StrPath], str]]:
+    """Return (backend, path -> hex digest) for the requested algorithm."""
+    backend = resolve_backend(algo, prefer_external_b3)
+    if backend == 'b3sum':
+        return backend, b3sum_one
+    if backend == 'blake3':
+        return backend, partial(blake3_file_py, max_threads=b3threads, io_backend=io_backend)
+    return backend, partial(sha256_file, io_backend=io_backend)
+
+# blake3 --blake3-mode: parallelize across files (outer) or inside each file
+# (inner), never both at once, which would oversubscribe the CPU
+B3_INNER_MIN = 64 * 1024 * 1024
+
+def plan_blake3(mode: str, sizes: Iterable[int], jobs: int, b3threads: int) -> Tuple[int, int]:
+    """Return (jobs, max_threads) for the blake3 binding under `mode`.
+
+    auto picks outer when more than 80% of the bytes sit in files smaller
+    than B3_INNER_MIN, inner otherwise.
+    """
+    if mode == 'auto':
+        total = small = 0
+        for n in sizes:
+            total += n
+            if n < B3_INNER_MIN:
+                small += n
+        mode = 'outer' if small >= 0.8 * total else 'inner'
+    if mode == 'outer':
+        return jobs, 1
+    return 1, b3threads
+
+def select_pool(backend: str, _hash: Callable[[StrPath], str], io_backend: str):
+    """Return (executor class, (abs path, rel path) -> (rel path, digest))."""
+    # sha256 is hashed in worker processes (own interpreter + OpenSSL context);
+    # blake3 backends release the GIL / run out of process, so threads suffice
+    if backend == 'sha256':
+        return ProcessPoolExecutor, partial(_hash_sha256_worker, io_backend=io_backend)
+    def _work(args: Tuple[str, str]) -> Tuple[str, str]:
+        path, rp_str = args
+        return rp_str, _hash(path)
+    return ThreadPoolExecutor, _work
+
 # --- Progress wrapper ---
 class Progress:
-    def __init__(self, total: int, desc: str):
+    """File counter; total=None when the count is not known up front."""
+    def __init__(self, total: Optional[int], desc: str):
         self.total = total
         self.count = 0
         self.desc = desc
@@ -89,20 +312,121 @@ class Progress:
             self.bar = tqdm(total=total, unit='file', desc=desc, file=sys.stderr)
         else:
             self.bar = None
-            print(f"{desc}: {total} files", file=sys.stderr)
+            if total is not None:
+                print(f"{desc}: {total} files", file=sys.stderr)
 
     def update(self, n: int = 1):
         self.count += n
         if self.use_bar:
             self.bar.update(n)  # type: ignore
         elif self.count % 100 == 0 or self.count == self.total:
+            self._print()
+
+    def _print(self):
+        if self.total is None:
+            print(f"{self.desc}: {self.count}", file=sys.stderr)
+        else:
             print(f"{self.desc}: {self.count}/{self.total}", file=sys.stderr)
 
     def close(self):
         if self.use_bar and self.bar:
             self.bar.close()  # type: ignore
+        elif self.total is None and self.count % 100:
+            self._print()
+
+def iter_bounded(ex, fn: Callable, items: Iterable, max_pending: int) -> Iterator:
+    """Yield fn(item) results in completion order, keeping at most
+    `max_pending` futures in flight so `items` is consumed lazily."""
+    pending = set()
+    for item in items:
+        pending.add(ex.submit(fn, item))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+    for fut in as_completed(pending):
+        yield fut.result()
+
+def manifest_rel(src: Path, manifest_out: str) -> Optional[str]:
+    """Relative path of manifest_out when it is written inside SRC, else None."""
+    if manifest_out == '-':
+        return None
+    try:
+        return Path(manifest_out).resolve().relative_to(src.resolve()).as_posix()
+    except ValueError:
+        return None
+
+def iter_src_files(src: Path, manifest_out: str) -> Iterator[Tuple[str, str]]:
+    """iter_rel_files(src), minus the manifest itself when written inside SRC."""
+    skip = manifest_rel(src, manifest_out)
+    return (f for f in iter_rel_files(src) if f[1] != skip)
 
 # --- Manifest I/O ---
+MANIFEST_BUFSIZE = 1024 * 1024
+
+MANIFEST_SEP = b'  '
+MANIFEST_NL = b'\n'
+
+def open_manifest_out(manifest_out: str):
+    """Binary stdout for "-", else the file with a large write buffer."""
+    if manifest_out == '-':
+        return sys.stdout.buffer
+    return open(manifest_out, 'wb', buffering=MANIFEST_BUFSIZE)
+
+def close_manifest_out(outfh) -> None:
+    if outfh is sys.stdout.buffer:
+        outfh.flush()
+    else:
+        outfh.close()
+
+def dump_manifest(outfh, results: list) -> None:
+    """Write (rel path, digest) pairs sorted by path, so manifests are
+    reproducible and diff cleanly regardless of completion order.
+
+    Lines are assembled as bytes (no formatting, no text-layer encode);
+    sorting the encoded paths gives the same order as LC_ALL=C sort.
+    """
+    lines = sorted((os.fsencode(rp_str), digest.encode('ascii')) for rp_str, digest in results)
+    outfh.writelines(digest + MANIFEST_SEP + rp + MANIFEST_NL for rp, digest in lines)
+
+# size buckets for write_manifest
+SMALL_FILE = 64 * 1024          # hashed inline by the walking thread
+HUGE_FILE = 1024 * 1024 * 1024  # blake3: hashed alone, all cores on one file
+
+class HashCache:
+    """Persistent digests keyed by (st_dev, st_ino, algo) in SQLite.
+
+    An entry is only used while size and mtime_ns still match, so edited
+    files are re-hashed automatically. Only touched from the main thread.
+    """
+    def __init__(self, path: str, algo: str, batch: int = 1000):
+        self.algo = algo
+        self.batch = batch
+        self.pending = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files (dev INTEGER, inode INTEGER, size INTEGER, "
+            "mtime_ns INTEGER, digest TEXT, algo TEXT, PRIMARY KEY (dev, inode, algo))")
+
+    def get(self, st: os.stat_result) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT digest FROM files WHERE dev=? AND inode=? AND size=? AND mtime_ns=? AND algo=?",
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, self.algo)).fetchone()
+        return row[0] if row else None
+
+    def put(self, st: os.stat_result, digest: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, digest, self.algo))
+        self.pending += 1
+        if self.pending >= self.batch:
+            self.db.commit()
+            self.pending = 0
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
 def write_manifest(
     src: Path,
     manifest_out: str,
@@ -110,66 +434,136 @@ def write_manifest(
     jobs: int,
     b3threads: int,
     prefer_external_b3: bool,
+    io_backend: str = 'sync',
+    blake3_mode: str = 'auto',
+    hash_cache: Optional[str] = None,
 ) -> None:
-    files = list(iter_rel_files(src))
-    prog = Progress(len(files), "Hashing")
+    # the walk is consumed lazily so hashing starts with the first file found
+    files = iter_src_files(src, manifest_out)
+    stats = ((path, rp_str, os.stat(path)) for path, rp_str in files)
+    prog = Progress(None, "Hashing")
 
-    # choose hasher function
-    use_b3sum = (algo == 'blake3' and prefer_external_b3 and have_cmd('b3sum'))
-    use_b3py  = (algo == 'blake3' and not use_b3sum and HAVE_BLAKE3)
-    if algo == 'auto':
-        if have_cmd('b3sum'):
-            use_b3sum = True
-        elif HAVE_BLAKE3:
-            use_b3py = True
-        else:
-            algo = 'sha256'  # fallback
+    backend = resolve_backend(algo, prefer_external_b3)
+    if backend == 'blake3':
+        if blake3_mode == 'auto':
+            stats = list(stats)  # auto needs the size profile before starting
+        jobs, b3threads = plan_blake3(blake3_mode, (st.st_size for _, _, st in stats), jobs, b3threads)
+    backend, _hash = select_hasher(algo, b3threads, prefer_external_b3, io_backend)
+    algo = ALGO_OF[backend]
+    Executor, _work = select_pool(backend, _hash, io_backend)
+    cache = HashCache(hash_cache, algo) if hash_cache else None
 
-    if algo == 'sha256':
-        def _hash(path: Path) -> str:
-            return sha256_file(path)
-    elif use_b3sum:
-        def _hash(path: Path) -> str:
-            return b3sum_one(path)
-    elif use_b3py:
-        def _hash(path: Path) -> str:
-            return blake3_file_py(path, max_threads=b3threads)
-    else:
-        # last-chance fallback
-        def _hash(path: Path) -> str:
-            return sha256_file(path)
-
-    # open output (stdout if "-")
-    outfh = sys.stdout if manifest_out == '-' else open(manifest_out, 'w', encoding='utf-8')
+    # open output (binary stdout if "-")
+    outfh = open_manifest_out(manifest_out)
+    results = []
     try:
-        with ThreadPoolExecutor(max_workers=jobs) as ex:
-            futs = {ex.submit(_hash, src / rp): rp for rp in files}
-            for fut in as_completed(futs):
-                rp = futs[fut]
-                digest = fut.result()
-                outfh.write(f"{digest}  {rp.as_posix()}\n")
-                prog.update(1)
+        def emit(rp_str: str, digest: str):
+            results.append((rp_str, digest))
+            prog.update(1)
+
+        # cache hits are emitted straight from the walk; misses go on to be
+        # hashed and their stat is kept until the digest comes back
+        stat_of = {}
+        def misses():
+            for path, rp_str, st in stats:
+                digest = cache.get(st) if cache else None
+                if digest is not None:
+                    emit(rp_str, digest)
+                    continue
+                if cache:
+                    stat_of[rp_str] = st
+                yield path, rp_str, st
+
+        def emit_new(rp_str: str, digest: str):
+            emit(rp_str, digest)
+            if cache:
+                cache.put(stat_of.pop(rp_str), digest)
+
+        if backend == 'b3sum':
+            # batched b3sum: one process per few hundred files, streamed back
+            for rp_str, digest in b3sum_many((rp_str for _, rp_str, _ in misses()), cwd=src):
+                emit_new(rp_str, digest)
+        else:
+            # Bucket by size as the walk goes: small files are not worth a pool
+            # round-trip, so they are hashed right here; huge blake3 files are
+            # set aside and hashed one at a time with blake3's own threads;
+            # everything else is fed to the pool.
+            huge = []
+            def medium():
+                for path, rp_str, st in misses():
+                    if st.st_size < SMALL_FILE:
+                        emit_new(rp_str, hash_small_file(path, algo))
+                    elif backend == 'blake3' and st.st_size >= HUGE_FILE:
+                        huge.append((path, rp_str))
+                    else:
+                        yield path, rp_str
+
+            # bounded in-flight window: the walk only runs ahead of the workers
+            # by a few batches instead of materializing the whole tree
+            with Executor(max_workers=jobs) as ex:
+                for rp_str, digest in iter_bounded(ex, _work, medium(), 4 * jobs):
+                    emit_new(rp_str, digest)
+            for path, rp_str in huge:
+                emit_new(rp_str, blake3_file_py(path, max_threads=B3_AUTO, io_backend=io_backend))
+        dump_manifest(outfh, results)
     finally:
         prog.close()
-        if outfh is not sys.stdout:
-            outfh.close()
+        if cache:
+            cache.close()
+        close_manifest_out(outfh)
 
-def parse_manifest_line(line: str) -> Tuple[str, Path]:
-    # "<hash>  <path>"
-    digest, rp = line.split(None, 1)
-    return digest, Path(rp.strip())
+def parse_manifest_line(line: bytes, lineno: int = 0) -> Tuple[str, bytes]:
+    # "<hash>  <path>", or "<hash> *<path>" as written by `sha256sum -b`;
+    # the path stays raw bytes until it is opened
+    digest, sep, rest = line.rstrip(b'\r').partition(b' ')
+    rp = rest[1:]
+    if not digest or not sep or rest[:1] not in (b' ', b'*') or not rp:
+        raise ValueError(f"malformed manifest line {lineno}: {line[:80]!r}")
+    return digest.decode('ascii'), rp
 
-def iter_manifest(manifest_in: str) -> Iterable[Tuple[str, Path]]:
-    infh = sys.stdin if manifest_in == '-' else open(manifest_in, 'r', encoding='utf-8')
+def iter_manifest(manifest_in: str) -> Iterable[Tuple[str, bytes]]:
+    # slurp once and split in bytes: no per-line decoding or Path objects
+    if manifest_in == '-':
+        buf = sys.stdin.buffer.read()
+    else:
+        with open(manifest_in, 'rb') as infh:
+            buf = infh.read()
+    return [parse_manifest_line(ln, i) for i, ln in enumerate(buf.split(b'\n'), 1) if ln]
+
+# --- Verify cache ---
+# TSV sidecar of files already verified under one target directory: a
+# "#root\t<real path of target>" header, then "<size>\t<mtime_ns>\t<digest>\t<path>".
+# The path goes last so it may itself contain tabs. The root matters because
+# rsync and the native copier keep size and mtime: entries recorded for SRC
+# would otherwise match the untouched-looking files at DST.
+CACHE_ROOT = b'#root\t'
+
+def load_cache(path: str, root: str) -> dict:
+    """Return {rel path bytes: (size, mtime_ns, digest)}; empty if the file
+    is missing or was written for a different root."""
+    cache = {}
     try:
-        for line in infh:
-            line = line.rstrip('\n')
-            if not line:
-                continue
-            yield parse_manifest_line(line)
-    finally:
-        if infh is not sys.stdin:
-            infh.close()
+        with open(path, 'rb') as fh:
+            buf = fh.read()
+    except FileNotFoundError:
+        return cache
+    header, _, body = buf.partition(b'\n')
+    if header != CACHE_ROOT + os.fsencode(root):
+        return cache
+    for ln in body.split(b'\n'):
+        if ln:
+            size, mtime_ns, digest, rp = ln.split(b'\t', 3)
+            cache[rp] = (int(size), int(mtime_ns), digest.decode('ascii'))
+    return cache
+
+def save_cache(path: str, root: str, cache: dict) -> None:
+    """Write the cache atomically (tmp file + rename)."""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb', buffering=MANIFEST_BUFSIZE) as fh:
+        fh.write(CACHE_ROOT + os.fsencode(root) + b'\n')
+        fh.writelines(b'%d\t%d\t%s\t%s\n' % (size, mtime_ns, digest.encode('ascii'), rp)
+                      for rp, (size, mtime_ns, digest) in cache.items())
+    os.replace(tmp, path)
 
 def verify_manifest(
     target: Path,
@@ -178,55 +572,365 @@ def verify_manifest(
     jobs: int,
     b3threads: int,
     prefer_external_b3: bool,
+    io_backend: str = 'sync',
+    trust_cache: Optional[str] = None,
+    blake3_mode: str = 'auto',
 ) -> int:
+    """Re-hash files under `target` against the manifest; return error count.
+
+    With `trust_cache`, files whose size and mtime still match an entry
+    verified earlier with the same digest are not re-read, and newly
+    verified files are added to the cache.
+    """
     pairs = list(iter_manifest(manifest_in))
     prog = Progress(len(pairs), "Verifying")
+    backend = resolve_backend(algo, prefer_external_b3)
 
-    # choose hasher
-    use_b3sum = (algo == 'blake3' and prefer_external_b3 and have_cmd('b3sum'))
-    use_b3py  = (algo == 'blake3' and not use_b3sum and HAVE_BLAKE3)
-    if algo == 'auto':
-        if have_cmd('b3sum'):
-            use_b3sum = True
-        elif HAVE_BLAKE3:
-            use_b3py = True
+    errors = 0
+    def report(kind: str, rp_str: str):
+        nonlocal errors
+        errors += 1
+        print(f"[{kind}] {rp_str}", file=sys.stderr)
+
+    target_str = str(target)
+    root = os.path.realpath(target_str)
+    cache = load_cache(trust_cache, root) if trust_cache else {}
+
+    try:
+        todo = []
+        for expect, rp in pairs:
+            # one str per file, used as-is by stat and the hasher
+            rp_str = os.fsdecode(rp)
+            p = target_str + '/' + rp_str
+            try:
+                st = os.stat(p)
+            except (FileNotFoundError, NotADirectoryError):
+                report('MISSING', rp_str)
+                prog.update(1)
+                continue
+            key = (st.st_size, st.st_mtime_ns, expect)
+            if cache.get(rp) == key:
+                prog.update(1)  # unchanged since it last verified
+                continue
+            todo.append((key, p, rp, rp_str))
+        # largest first so one big file doesn't end up as the lone tail job
+        todo.sort(key=lambda t: t[0][0], reverse=True)
+
+        if backend == 'blake3':
+            jobs, b3threads = plan_blake3(blake3_mode, (t[0][0] for t in todo), jobs, b3threads)
+        backend, _hash = select_hasher(algo, b3threads, prefer_external_b3, io_backend)
+        Executor, _work = select_pool(backend, _hash, io_backend)
+
+        with Executor(max_workers=jobs) as ex:
+            futs = {ex.submit(_work, (p, rp_str)): (rp, key)
+                    for key, p, rp, rp_str in todo}
+            # completion order: workers stay busy and errors surface at once
+            for fut in as_completed(futs):
+                rp_str, got = fut.result()
+                rp, key = futs[fut]
+                if got != key[2]:
+                    report('MISMATCH', rp_str)
+                    cache.pop(rp, None)
+                elif trust_cache:
+                    cache[rp] = key
+                prog.update(1)
+    finally:
+        prog.close()
+        if trust_cache:
+            save_cache(trust_cache, root, cache)
+
+    return errors
+
+# --- Copy ---
+HAVE_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+
+def iter_tree(root: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (path, relative POSIX path, kind) for everything under root.
+
+    Unlike iter_rel_files nothing is excluded and no symlink is followed;
+    kind is 'dir', 'link', 'file' or 'other' (devices, FIFOs, sockets).
+    A directory is yielded before anything inside it.
+    """
+    cut = len(os.path.join(str(root), ''))
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    kind = 'link'
+                elif entry.is_dir(follow_symlinks=False):
+                    kind = 'dir'
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    kind = 'file'
+                else:
+                    kind = 'other'
+                rel = entry.path[cut:]
+                if os.sep != '/':
+                    rel = rel.replace(os.sep, '/')
+                yield entry.path, rel, kind
+
+def up_to_date(s: Path, d: Path) -> bool:
+    """rsync-style quick check: same size and mtime at DST."""
+    try:
+        st, dt = s.lstat(), d.lstat()
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return dt.st_size == st.st_size and dt.st_mtime_ns == st.st_mtime_ns
+
+def link_up_to_date(s: Path, d: Path) -> bool:
+    try:
+        return os.readlink(d) == os.readlink(s)
+    except OSError:
+        return False
+
+# rsync -a keeps owner and group only when run as root; so do the native copiers
+KEEP_OWNER = hasattr(os, 'geteuid') and os.geteuid() == 0
+
+def _install(s: Path, tmp: str, d: Path) -> None:
+    # owner, then mode and times, then rename over d
+    if KEEP_OWNER:
+        st = s.stat()
+        os.chown(tmp, st.st_uid, st.st_gid)
+    shutil.copystat(s, tmp)
+    os.replace(tmp, d)
+
+@contextlib.contextmanager
+def atomic_write(s: Path, d: Path) -> Iterator:
+    """Yield a file open for writing beside d; on success it takes s's
+    metadata and is renamed over d.
+
+    As with rsync, a read-only file already at DST is replaced instead of
+    opened for writing, and an interrupted copy never leaves a truncated
+    file under the real name.
+    """
+    fd, tmp = tempfile.mkstemp(dir=d.parent, prefix=f'.{d.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as fo:
+            yield fo
+        _install(s, tmp, d)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def copy_file_native(s: Path, d: Path) -> None:
+    """Copy one file inside the kernel, carrying over mode and times.
+
+    copy_file_range() never moves data through user space and is O(1) on
+    reflink filesystems (XFS, Btrfs); where it is unsupported (old kernels,
+    some cross-filesystem pairs) fall back to a plain read/write loop.
+    """
+    with s.open('rb', buffering=0) as fi, atomic_write(s, d) as fo:
+        if HAVE_COPY_FILE_RANGE:
+            try:
+                while os.copy_file_range(fi.fileno(), fo.fileno(), 1 << 30):
+                    pass
+                return
+            except OSError:
+                fi.seek(0)
+                fo.seek(0)
+                fo.truncate()
+        shutil.copyfileobj(fi, fo, 1024 * 1024)
+
+def copy_symlink(s: Path, d: Path) -> None:
+    """Recreate symlink s at d (not what it points to), keeping its mtime."""
+    tmp = os.path.join(d.parent, f'.{d.name}.{os.urandom(4).hex()}')
+    os.symlink(os.readlink(s), tmp)
+    try:
+        st = s.lstat()
+        if KEEP_OWNER:
+            os.lchown(tmp, st.st_uid, st.st_gid)
+        if os.utime in os.supports_follow_symlinks:
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+        os.replace(tmp, d)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _writable_dir(d: Path) -> None:
+    # a directory made read-only by an earlier run's finish_dirs() would
+    # refuse our temp files; like rsync, add u+w until finish_dirs() puts
+    # the SRC mode back
+    mode = d.stat().st_mode
+    if not mode & 0o200:
+        os.chmod(d, mode | 0o200)
+
+def iter_copy_items(src: Path, dst: Path, dry_run: bool, dirs: list,
+                    skip: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+    """iter_tree(src) for the native copiers.
+
+    Directories are created at DST as they are reached and recorded in
+    `dirs` for finish_dirs(); special files are reported and skipped; the
+    remaining (path, rel, kind) items ('file' or 'link') are yielded.
+    """
+    dirs.append((str(src), dst))
+    if not dry_run:
+        dst.mkdir(parents=True, exist_ok=True)
+        _writable_dir(dst)
+    for path, rel, kind in iter_tree(src):
+        if kind == 'dir':
+            d = dst / rel
+            if not dry_run:
+                d.mkdir(exist_ok=True)
+                _writable_dir(d)
+            dirs.append((path, d))
+        elif kind == 'other':
+            print(f"[SKIP] {rel}: not a file, directory or symlink (use --copier rsync)", file=sys.stderr)
+        elif rel != skip:
+            yield path, rel, kind
+
+def finish_dirs(dirs: list) -> None:
+    # children were recorded after their parents: going backwards sets each
+    # directory's times after the last write into it
+    for path, d in reversed(dirs):
+        if KEEP_OWNER:
+            st = os.stat(path)
+            os.chown(d, st.st_uid, st.st_gid)
+        shutil.copystat(path, d)
+
+def local_copy(src: Path, dst: Path, jobs: int, dry_run: bool) -> None:
+    """Mirror SRC -> DST without rsync, skipping files that pass up_to_date.
+
+    Like rsync -a, everything is carried over (.DS_Store and ._* included):
+    directories, even empty ones, and symlinks as symlinks, with mode and
+    times (and owner when run as root). Special files are skipped.
+    """
+    def _copy_one(item: Tuple[str, str, str]) -> Optional[str]:
+        path, rp_str, kind = item
+        s, d = Path(path), dst / rp_str
+        if kind == 'link':
+            if link_up_to_date(s, d):
+                return None
+            if not dry_run:
+                copy_symlink(s, d)
         else:
-            algo = 'sha256'
-    if algo == 'sha256':
-        def _hash(path: Path) -> str:
-            return sha256_file(path)
-    elif use_b3sum:
-        def _hash(path: Path) -> str:
-            return b3sum_one(path)
-    elif use_b3py:
-        def _hash(path: Path) -> str:
-            return blake3_file_py(path, max_threads=b3threads)
-    else:
-        def _hash(path: Path) -> str:
-            return sha256_file(path)
+            if up_to_date(s, d):
+                return None
+            if not dry_run:
+                copy_file_native(s, d)
+        return rp_str
 
-    errors = 0
-    def check_one(pair: Tuple[str, Path]):
-        expect, rp = pair
-        p = target / rp
-        if not p.exists():
-            return (rp, 'MISSING', expect, '')
-        got = _hash(p)
-        if got != expect:
-            return (rp, 'MISMATCH', expect, got)
-        return None
+    prog = Progress(None, "Copying")
+    copied = 0
+    dirs: list = []
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            items = iter_copy_items(src, dst, dry_run, dirs)
+            for rp_str in iter_bounded(ex, _copy_one, items, 4 * jobs):
+                if rp_str is not None:
+                    copied += 1
+                    if dry_run:
+                        print(f"would copy: {rp_str}", file=sys.stderr)
+                prog.update(1)
+        if not dry_run:
+            finish_dirs(dirs)
+    finally:
+        prog.close()
+    print(f"{'Would copy' if dry_run else 'Copied'} {copied} of {prog.count} file(s).", file=sys.stderr)
+
+def copy_and_hash(
+    src: Path,
+    dst: Path,
+    manifest_out: str,
+    algo: str,
+    jobs: int,
+    chunk: int = 1024 * 1024,
+) -> int:
+    """Copy SRC -> DST and hash each file from the same read (single pass).
+
+    Copies exactly what local_copy does; the manifest covers the same files
+    as make-manifest (symlinks hashed through to their target). Files that
+    are not copied because they pass up_to_date are read at both ends and
+    compared, so this also does verify's job: a DST copy that differs is
+    reported and copied again. Returns the number of problems found.
+    """
+    if algo != 'sha256' and not HAVE_BLAKE3:
+        raise RuntimeError("single-pass copy needs the blake3 module or --algo sha256")
+
+    # `jobs` files are in flight at once, so each hasher gets one thread
+    # (--blake3-mode outer); per-file threads on top would oversubscribe
+    def new_hasher():
+        if algo == 'sha256':
+            return new_sha256()
+        return blake3_hasher(max_threads=1)
 
+    def hash_path(p: Path) -> str:
+        return sha256_file(p) if algo == 'sha256' else blake3_file_py(p, max_threads=1)
+
+    def in_manifest(path: str, rp_str: str, kind: str) -> bool:
+        # same selection as iter_rel_files
+        n = rp_str.rpartition('/')[2]
+        if n in EXCLUDES or n.startswith(EXCLUDE_PREFIXES):
+            return False
+        return kind == 'file' or os.path.isfile(path)
+
+    def _copy_one(item: Tuple[str, str, str]) -> Optional[Tuple[str, str, Optional[str]]]:
+        # -> (rel, SRC digest, problem or None), or None when not in the manifest
+        path, rp_str, kind = item
+        s, d = Path(path), dst / rp_str
+        listed = in_manifest(path, rp_str, kind)
+        if kind == 'link':
+            if not link_up_to_date(s, d):
+                copy_symlink(s, d)
+            # the link text is what is mirrored; its target, when inside SRC,
+            # is checked as a file of its own
+            return (rp_str, hash_path(s), None) if listed else None
+        if not listed:
+            if not up_to_date(s, d):
+                copy_file_native(s, d)
+            return None
+        problem = None
+        if up_to_date(s, d):
+            digest = hash_path(s)
+            if hash_path(d) == digest:
+                return rp_str, digest, None
+            # same size and mtime but different bytes: rsync would keep it
+            problem = 'MISMATCH, copied again'
+        h = new_hasher()
+        mv = memoryview(bytearray(chunk))
+        with s.open('rb', buffering=0) as fi, atomic_write(s, d) as fo:
+            _advise_sequential(fi)
+            while True:
+                n = fi.readinto(mv)
+                if not n:
+                    break
+                fo.write(mv[:n])
+                h.update(mv[:n])
+            _advise_dontneed(fi)
+            fo.flush()
+            _advise_dontneed(fo)  # only drops pages already written back
+        return rp_str, h.hexdigest(), problem
+
+    # the manifest is still being written during the walk: copy it last
+    skip = manifest_rel(src, manifest_out)
+    prog = Progress(None, "Copying")
+    outfh = open_manifest_out(manifest_out)
+    results = []
+    dirs: list = []
+    errors = 0
     try:
         with ThreadPoolExecutor(max_workers=jobs) as ex:
-            for res in ex.map(check_one, pairs):
-                if res:
-                    errors += 1
-                    rp, kind, expect, got = res
-                    print(f"[{kind}] {rp}", file=sys.stderr)
+            items = iter_copy_items(src, dst, False, dirs, skip)
+            for res in iter_bounded(ex, _copy_one, items, 4 * jobs):
+                if res is not None:
+                    rp_str, digest, problem = res
+                    if problem:
+                        errors += 1
+                        print(f"[{problem}] {rp_str}", file=sys.stderr)
+                    results.append((rp_str, digest))
                 prog.update(1)
+        dump_manifest(outfh, results)
     finally:
         prog.close()
+        close_manifest_out(outfh)
 
+    # keep the manifest alongside the copy, as the rsync path does
+    if skip is not None:
+        copy_file_native(Path(manifest_out), dst / skip)
+    finish_dirs(dirs)
     return errors
 
 def rsync_copy(src: Path, dst: Path, dry_run: bool) -> None:
@@ -235,8 +939,12 @@ def rsync_copy(src: Path, dst: Path, dry_run: bool) -> None:
         cmd.insert(2, '--dry-run')
     subprocess.check_call(cmd)
 
+def is_remote(p: Path) -> bool:
+    # rsync's rule: a colon before the first slash means host:path
+    return ':' in str(p).split('/', 1)[0]
+
 # --- CLI ---
-def main() -> int:
+def main(argv: Optional[list] = None) -> int:
     ap = argparse.ArgumentParser(
         description="Mirror with content manifest and verification"
     )
@@ -247,12 +955,28 @@ def main() -> int:
                     help='parallel hashing jobs (default: CPU count)')
     ap.add_argument('--blake3-threads', type=int, default=int(os.environ.get('MIRROR_B3THREADS', 0)),
                     help='BLAKE3 internal threads per file (0=AUTO)')
+    ap.add_argument('--blake3-mode', choices=('auto', 'outer', 'inner'), default='auto',
+                    help='Python blake3 parallelism: outer = --jobs files at once, one thread each '
+                         '(many small files); inner = one file at a time using --blake3-threads '
+                         '(few big files); auto = outer if >80%% of bytes are in files <64 MiB, '
+                         'else inner. Running both at once oversubscribes the CPU.')
     ap.add_argument('--algo', choices=('auto', 'blake3', 'sha256'), default='auto',
                     help='hash algorithm: auto (prefer blake3), blake3, or sha256')
     ap.add_argument('--prefer-external-b3', action='store_true',
                     help='prefer external b3sum if available')
+    ap.add_argument('--io-backend', choices=('sync', 'readahead'), default='sync',
+                    help='file reads for in-process hashing: sync (one read at a time) or '
+                         f'readahead ({READAHEAD_DEPTH} reads in flight; helps NVMe/cold cache)')
+    ap.add_argument('--hash-cache', default=None, metavar='PATH',
+                    help='make-manifest: SQLite cache of digests keyed by device+inode; files whose '
+                         'size+mtime are unchanged since the last run are not re-read')
+    ap.add_argument('--trust-cache', default=None, metavar='PATH',
+                    help='verify: skip files whose size+mtime match an earlier successful '
+                         'verification of the same target recorded in PATH (created/updated '
+                         'as needed; a cache written for another directory is ignored)')
     ap.add_argument('--manifest', default=None,
-                    help='manifest path; for make-manifest: write here (default SRC/BLAKE3SUMS). '
+                    help='manifest path; for make-manifest: write here (default SRC/BLAKE3SUMS, '
+                         'or SHA256SUMS when hashing falls back to sha256). '
                          'For verify: read from here (default DST/BLAKE3SUMS, else SRC/BLAKE3SUMS). '
                          'Use "-" for stdout/stdin.')
 
@@ -261,32 +985,89 @@ def main() -> int:
     ap.add_argument('--dry-run', action='store_true', help='dry-run for copy/all')
     ap.add_argument('--step', choices=('all', 'make-manifest', 'copy', 'verify'), default='all',
                     help='run a single step or all (default)')
+    ap.add_argument('--copier', choices=('native', 'rsync'), default=None,
+                    help='copy step: native (in-kernel copy_file_range, local paths only) or rsync '
+                         '(default: native unless SRC or DST is host:path)')
+    ap.add_argument('--two-pass', action='store_true',
+                    help='for all: manifest, copy, then verify at DST instead of '
+                         'copying and hashing in a single read of SRC (always used '
+                         'with rsync)')
 
     # positional
     ap.add_argument('src', type=Path, nargs='?')
     ap.add_argument('dst', type=Path, nargs='?')
 
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     ts = time.strftime('%Y%m%d-%H%M%S')
     print(f"=== Mirror ===\nTime : {ts}\nStep : {args.step}\nDry  : {args.dry_run}\nAlgo : {args.algo}\n",
           file=sys.stderr)
 
     try:
+        # resolve once so default manifest names match the digests written
+        algo, backend, default_name = args.algo, None, None
+        if args.step != 'copy':
+            backend = resolve_backend(args.algo, args.prefer_external_b3)
+            algo = ALGO_OF[backend]
+            default_name = MANIFEST_NAMES[algo]
+
+        remote = any(p is not None and is_remote(p) for p in (args.src, args.dst))
+        copier = args.copier or ('rsync' if remote else 'native')
+        if copier == 'native' and remote and args.step in ('all', 'copy'):
+            print("--copier native needs local SRC and DST", file=sys.stderr)
+            return 2
+
+        # single pass: a copied file is read once, written to DST and hashed
+        # from the same buffer; a file already at DST is read at both ends
+        # and compared, so no separate verify pass is needed; this is
+        # the native copier, so it needs local paths and no --copier rsync
+        single_pass = (args.step == 'all' and not args.two_pass and not args.dry_run
+                       and copier == 'native')
+        if single_pass:
+            # hashing choices only the make-manifest/verify passes honour
+            wants = [flag for flag, on in (
+                ('--prefer-external-b3', backend == 'b3sum' and args.prefer_external_b3),
+                ('no blake3 module', backend == 'b3sum' and not HAVE_BLAKE3),
+                ('--hash-cache', args.hash_cache is not None),
+                ('--io-backend readahead', args.io_backend != 'sync'),
+                ('--blake3-mode inner', algo == 'blake3' and args.blake3_mode == 'inner'),
+                ('--blake3-threads', algo == 'blake3' and args.blake3_threads != 0),
+            ) if on]
+            if wants:
+                print(f"[INFO] {', '.join(wants)}: running manifest → copy → verify", file=sys.stderr)
+                single_pass = False
+        if single_pass:
+            if not (args.src and args.dst):
+                print("SRC and DST required for all", file=sys.stderr)
+                return 2
+            mf_out = args.manifest or str(args.src / default_name)
+            print(f"[1/1] Copying and hashing in one pass → {mf_out}", file=sys.stderr)
+            errs = copy_and_hash(args.src, args.dst, mf_out, algo, args.jobs)
+            if errs:
+                print(f"[ERROR] DST did not match SRC: {errs} problem(s).", file=sys.stderr)
+                return 1
+            print("[OK] Copy complete; copied files hashed as written, existing files "
+                  "compared with SRC.", file=sys.stderr)
+            return 0
+
         if args.step in ('all', 'make-manifest'):
             if not args.src:
                 print("SRC required for make-manifest", file=sys.stderr)
                 return 2
-            mf_out = args.manifest or str(args.src / ('BLAKE3SUMS' if args.algo != 'sha256' else 'SHA256SUMS'))
+            mf_out = args.manifest or str(args.src / default_name)
             print(f"[1/3] Creating manifest at source → {mf_out}", file=sys.stderr)
-            write_manifest(args.src, mf_out, args.algo, args.jobs, args.blake3_threads, args.prefer_external_b3)
+            write_manifest(args.src, mf_out, args.algo, args.jobs, args.blake3_threads, args.prefer_external_b3,
+                           args.io_backend, args.blake3_mode, args.hash_cache)
 
         if args.step in ('all', 'copy'):
             if not (args.src and args.dst):
                 print("SRC and DST required for copy", file=sys.stderr)
                 return 2
-            print("[2/3] Copying with rsync...", file=sys.stderr)
-            rsync_copy(args.src, args.dst, args.dry_run)
+            print(f"[2/3] Copying with {copier}...", file=sys.stderr)
+            if copier == 'native':
+                local_copy(args.src, args.dst, args.jobs, args.dry_run)
+            else:
+                rsync_copy(args.src, args.dst, args.dry_run)
             if args.dry_run and args.step == 'copy':
                 print("[OK] Dry-run complete.", file=sys.stderr)
                 return 0
@@ -296,7 +1077,6 @@ def main() -> int:
             if args.manifest:
                 mf_in = args.manifest
             else:
-                default_name = 'BLAKE3SUMS' if args.algo != 'sha256' else 'SHA256SUMS'
                 candidate = (args.dst / default_name) if args.dst else None
                 if candidate and candidate.exists():
                     mf_in = str(candidate)
@@ -314,7 +1094,8 @@ def main() -> int:
                 return 2
 
             print(f"[3/3] Verifying at {target} using {mf_in}", file=sys.stderr)
-            errs = verify_manifest(target, mf_in, args.algo, args.jobs, args.blake3_threads, args.prefer_external_b3)
+            errs = verify_manifest(target, mf_in, args.algo, args.jobs, args.blake3_threads, args.prefer_external_b3,
+                                   args.io_backend, args.trust_cache, args.blake3_mode)
             if errs:
                 print(f"[ERROR] Verification failed: {errs} problem(s).", file=sys.stderr)
                 return 1
@@ -0,0 +1,72 @@
+"""Smoke tests for mirror_tool.py; run with: python -W error -m pytest scripts"""
+
+import os, subprocess, sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+import mirror_tool as mt  # noqa: E402
+
+
+def make_tree(root: Path) -> None:
+    (root / 'sub' / 'deep').mkdir(parents=True)
+    (root / 'empty').mkdir()
+    (root / 'a.txt').write_bytes(b'hello\n')
+    (root / 'sub' / 'deep' / 'big.bin').write_bytes(os.urandom(3 * 1024 * 1024))
+    (root / '.DS_Store').write_bytes(b'finder')
+    (root / 'link').symlink_to('a.txt')
+
+
+def corrupt_keep_mtime(path: Path) -> None:
+    st = path.stat()
+    data = bytearray(path.read_bytes())
+    data[:3] = b'XYZ'
+    path.write_bytes(bytes(data))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_import_is_warning_free():
+    subprocess.run([sys.executable, '-W', 'error', '-c', 'import mirror_tool'], cwd=HERE, check=True)
+
+
+def test_help():
+    with pytest.raises(SystemExit) as exc:
+        mt.main(['--help'])
+    assert exc.value.code == 0
+
+
+def test_parse_manifest_line():
+    assert mt.parse_manifest_line(b'ab12  dir/a b.txt') == ('ab12', b'dir/a b.txt')
+    assert mt.parse_manifest_line(b'ab12 *a.txt\r') == ('ab12', b'a.txt')
+    with pytest.raises(ValueError, match='line 7'):
+        mt.parse_manifest_line(b'ab12', 7)
+
+
+def test_manifest_and_verify(tmp_path):
+    src = tmp_path / 'src'
+    make_tree(src)
+    common = ['--algo', 'sha256', '--jobs', '2']
+    assert mt.main(['--step', 'make-manifest', *common, str(src)]) == 0
+    names = sorted(ln.split(b'  ', 1)[1] for ln in (src / 'SHA256SUMS').read_bytes().splitlines())
+    assert names == [b'a.txt', b'link', b'sub/deep/big.bin']
+    assert mt.main(['--step', 'verify', *common, str(src)]) == 0
+    corrupt_keep_mtime(src / 'a.txt')
+    assert mt.main(['--step', 'verify', *common, str(src)]) == 1
+
+
+def test_single_pass_copy(tmp_path):
+    src, dst = tmp_path / 'src', tmp_path / 'dst'
+    make_tree(src)
+    args = ['--algo', 'sha256', '--jobs', '2', str(src), str(dst)]
+    assert mt.main(args) == 0
+    assert (dst / 'sub' / 'deep' / 'big.bin').read_bytes() == (src / 'sub' / 'deep' / 'big.bin').read_bytes()
+    assert (dst / '.DS_Store').exists() and (dst / 'empty').is_dir()
+    assert os.readlink(dst / 'link') == 'a.txt'
+    assert mt.main(['--step', 'verify', '--algo', 'sha256', str(src), str(dst)]) == 0
+    # same size and mtime, different bytes: reported, then copied again
+    corrupt_keep_mtime(dst / 'sub' / 'deep' / 'big.bin')
+    assert mt.main(args) == 1
+    assert mt.main(args) == 0
+    assert (dst / 'sub' / 'deep' / 'big.bin').read_bytes() == (src / 'sub' / 'deep' / 'big.bin').read_bytes()